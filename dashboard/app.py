@@ -5,26 +5,33 @@ Real-time monitoring dashboard for the Collateral Vault system
 
 import streamlit as st
 import requests
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import diskcache
+import ijson
+import orjson
 from datetime import datetime, timedelta
-import time
+import functools
+import itertools
+import os
+import tempfile
+import re
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from streamlit_autorefresh import st_autorefresh
 from websocket_integration import create_websocket_component
 
 # Configuration
 BACKEND_URL = "http://localhost:8080"  # Change if backend runs on different port
+REQUEST_TIMEOUT = (1, 3)  # (connect, read) seconds
+HEALTH_TIMEOUT = (0.5, 1.0)  # Health probe should fail fast when backend is down
+POOL_SIZE = 10  # Keep-alive connections kept open to the backend
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "vault_dash_cache")  # Shared by all dashboard processes
+TRANSACTION_PAGE_SIZE = 20  # Rows shown in the transaction history table
 
-# Page config
-st.set_page_config(
-    page_title="Collateral Vault Dashboard",
-    page_icon="🏦",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# Custom CSS
-st.markdown("""
+# Static page chrome (emitted each rerun - Streamlit drops elements a run skips)
+_CSS = """
 <style>
     .metric-card {
         background-color: #0e1117;
@@ -36,59 +43,140 @@ st.markdown("""
         background-color: #0e1117;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+_FOOTER = """
+<div style='text-align: center; color: #666;'>
+    <p>Collateral Vault Dashboard | Built with Streamlit</p>
+    <p>Backend API: <code>{}</code></p>
+</div>
+""".format(BACKEND_URL)
+
+# Page config
+st.set_page_config(
+    page_title="Collateral Vault Dashboard",
+    page_icon="🏦",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Custom CSS
+st.markdown(_CSS, unsafe_allow_html=True)
 
+@st.cache_resource
+def _session():
+    """Shared HTTP session so reruns reuse warm keep-alive connections"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=POOL_SIZE,
+        pool_maxsize=POOL_SIZE,
+        # Retry failed connects, but don't re-send a GET whose read timed out
+        max_retries=Retry(total=2, read=0, backoff_factor=0.1)
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # The health probe gets a single attempt (longest mount prefix wins),
+    # so an offline backend is reported within HEALTH_TIMEOUT
+    session.mount(f"{BACKEND_URL}/health", HTTPAdapter(max_retries=0))
+    return session
+
+@st.cache_resource
+def _disk_cache():
+    """On-disk response cache that survives restarts and is shared across processes"""
+    return diskcache.Cache(CACHE_DIR)
+
+def _user_tag(user_pubkey):
+    """Disk cache tag for a user's entries, so Refresh can drop just those"""
+    return f"{BACKEND_URL}|{user_pubkey}"
+
+def _drop_vault_cache(user_pubkey):
+    """Forget cached balance and transactions so the next run refetches them"""
+    get_vault_balance.clear()
+    get_transactions.clear()
+    _disk_cache().evict(_user_tag(user_pubkey))
+
+def _state_key(balance_data):
+    """Vault's last update time - changes whenever its transaction history can"""
+    return balance_data.get("lastUpdated") or balance_data.get("last_updated")
+
+@st.cache_data(ttl=3, show_spinner=False)
 def check_backend_health():
     """Check if backend is running"""
     try:
-        response = requests.get(f"{BACKEND_URL}/health", timeout=2)
+        response = _session().get(f"{BACKEND_URL}/health", timeout=HEALTH_TIMEOUT)
         return response.status_code == 200
     except:
         return False
 
+@st.cache_data(ttl=5, show_spinner=False)
 def get_vault_balance(user_pubkey):
-    """Get vault balance for a user"""
-    try:
-        response = requests.get(f"{BACKEND_URL}/vault/balance/{user_pubkey}")
-        if response.status_code == 200:
-            data = response.json()
-            # Extract data from API response structure
-            # API returns: {"success": true, "data": {...}}
-            if isinstance(data, dict) and "data" in data:
-                return data["data"]
-            return data
-        return None
-    except Exception as e:
-        st.error(f"Error fetching balance: {e}")
-        return None
+    """Get vault balance for a user (raises on request errors)"""
+    response = _session().get(f"{BACKEND_URL}/vault/balance/{user_pubkey}", timeout=REQUEST_TIMEOUT)
+    if response.status_code == 200:
+        data = orjson.loads(response.content)
+        # Extract data from API response structure
+        # API returns: {"success": true, "data": {...}}
+        if isinstance(data, dict) and "data" in data:
+            return data["data"]
+        return data
+    return None
 
-def get_transactions(user_pubkey):
-    """Get transaction history for a user"""
-    try:
-        response = requests.get(f"{BACKEND_URL}/vault/transactions/{user_pubkey}")
-        if response.status_code == 200:
-            data = response.json()
-            # Extract transactions from API response structure
-            # API returns: {"success": true, "data": {"transactions": [...], ...}}
-            if isinstance(data, dict) and "data" in data:
-                return data["data"]
-            return data
-        return None
-    except Exception as e:
-        st.error(f"Error fetching transactions: {e}")
-        return None
+@st.cache_data(ttl=5, show_spinner=False)
+def get_transactions(user_pubkey, state_key=None, limit=TRANSACTION_PAGE_SIZE):
+    """
+    Get the latest page of transaction history for a user (raises on request errors).
+    
+    Returns {"transactions": [...]}. Only the backend's
+    {"data": {"transactions": [...]}} response shape is read; rows are
+    streamed from that path, so any other shape yields an empty page.
+    
+    When state_key (see _state_key) is given, the page is also kept in the
+    disk cache until the vault changes, so it is only refetched after new
+    activity (or after a minute, to pick up status changes).
+    """
+    # Keyed by backend too: the cache dir is shared by every dashboard process
+    cache_key = (BACKEND_URL, user_pubkey, "transactions", state_key, limit)
+    if state_key is not None:
+        cached = _disk_cache().get(cache_key)
+        if cached is not None:
+            return cached
+    
+    with _session().get(
+        f"{BACKEND_URL}/vault/transactions/{user_pubkey}",
+        params={"limit": limit},
+        timeout=REQUEST_TIMEOUT,
+        stream=True
+    ) as response:
+        if response.status_code != 200:
+            return None
+        # API returns: {"success": true, "data": {"transactions": [...], ...}}
+        # Parse the rows straight off the socket and stop after one page
+        response.raw.decode_content = True
+        items = ijson.items(response.raw, "data.transactions.item", use_float=True)
+        transactions = {"transactions": list(itertools.islice(items, limit))}
+    
+    if state_key is not None:
+        _disk_cache().set(cache_key, transactions, expire=60, tag=_user_tag(user_pubkey))
+    return transactions
 
+@st.cache_data(ttl=5, show_spinner=False)
 def get_tvl():
     """Get Total Value Locked"""
     try:
+        # Other dashboard processes may have fetched it in the last few seconds
+        tvl = _disk_cache().get((BACKEND_URL, "tvl"))
+        if tvl is not None:
+            return tvl
+        
         # Use shorter timeout and handle errors gracefully
-        response = requests.get(f"{BACKEND_URL}/vault/tvl", timeout=3)
+        response = _session().get(f"{BACKEND_URL}/vault/tvl", timeout=REQUEST_TIMEOUT)
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             # Extract data from API response structure
             # API returns: {"success": true, "data": {...}}
             if isinstance(data, dict) and "data" in data:
-                return data["data"]
+                data = data["data"]
+            _disk_cache().set((BACKEND_URL, "tvl"), data, expire=5)
             return data
         return None
     except requests.exceptions.ConnectionError:
@@ -104,9 +192,278 @@ def get_tvl():
         # Any other error - don't crash the dashboard
         return None
 
+@st.cache_resource
+def _executor():
+    """Shared worker pool for issuing the independent backend GETs concurrently"""
+    return ThreadPoolExecutor(max_workers=4)
+
+def fetch_all(user_pubkey):
+    """
+    Fetch health, TVL and (if a wallet is selected) balance and transactions
+    concurrently, so a rerun waits for the slowest call instead of all of them.
+    Transactions are requested as soon as the balance arrives, since their
+    cache key depends on the vault's state.
+
+    Returns a dict keyed by "health", "tvl", "balance" and "transactions".
+    Exceptions raised by a fetch are collected under "errors" instead.
+    If the health probe fails, it returns right away without waiting on the
+    other calls - the page stops on an offline backend anyway.
+    The cached getters keep the responses, so the render functions reading
+    them again during the same rerun don't hit the backend; transactions
+    (and their error) are handed to render_transactions directly, since
+    a failed fetch isn't cached and would otherwise be retried.
+    """
+    ctx = get_script_run_ctx()
+
+    def run(fn, *args):
+        # Attach the script context so Streamlit caches work inside the pool
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fn(*args)
+
+    calls = {
+        "health": (check_backend_health,),
+        "tvl": (get_tvl,),
+    }
+    if user_pubkey:
+        calls["balance"] = (get_vault_balance, user_pubkey)
+
+    pending = {_executor().submit(run, *call): key for key, call in calls.items()}
+    results = {"health": False, "tvl": None, "balance": None, "transactions": None, "errors": {}}
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            key = pending.pop(future)
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                results["errors"][key] = e
+                continue
+            if key == "health" and not results["health"]:
+                # Leave the rest to finish (or time out) in the pool
+                return results
+            if key == "balance" and results["balance"]:
+                state_key = _state_key(results["balance"])
+                pending[_executor().submit(run, get_transactions, user_pubkey, state_key)] = "transactions"
+    return results
+
+_NUM_RE = re.compile(r"^-?\d+(?:\.\d+)?$")
+
+def _as_int(d, *keys):
+    """
+    Return the first truthy value among keys as an int, so both camelCase and
+    snake_case API fields work. Numeric strings are parsed; anything else is 0.
+    """
+    for key in keys:
+        value = d.get(key)
+        if value:
+            if isinstance(value, str):
+                return int(float(value)) if _NUM_RE.match(value) else 0
+            return int(value)
+    return 0
+
+# Transaction table columns in display order. Each group lists alternative
+# names (API naming style or fallback); the first one present is shown.
+_DATE_COLUMNS = ("created_at", "createdAt", "timestamp", "date")
+_DISPLAY_COLUMNS = (
+    ("transaction_type", "transactionType"),
+    ("amount", "formatted_amount"),
+    ("status",),
+    _DATE_COLUMNS,
+)
+
+_FMT = "{:,.2f} USDT".format
+_SCALE = 1_000_000  # USDT has 6 decimals
+
 def format_usdt(amount):
     """Format USDT amount (6 decimals)"""
-    return f"{amount / 1_000_000:,.2f} USDT"
+    return _FMT(amount / _SCALE)
+
+@st.fragment(run_every=5)
+def render_tvl():
+    """TVL metrics; refreshes on its own timer without rerunning the page"""
+    # TVL is optional - get_tvl already returns None on any failure
+    tvl_data = get_tvl()
+    
+    if tvl_data:
+        # API returns camelCase: totalValueLocked, activeVaults, totalLocked, totalAvailable
+        total_tvl = _as_int(tvl_data, "totalValueLocked", "total_value_locked")
+        total_vaults = _as_int(tvl_data, "activeVaults", "active_vaults")
+        total_locked = _as_int(tvl_data, "totalLocked", "total_locked")
+        total_available = _as_int(tvl_data, "totalAvailable", "total_available")
+    
+        col1, col2, col3, col4 = st.columns(4)
+    
+        with col1:
+            st.metric(
+                "Total TVL",
+                format_usdt(total_tvl),
+                delta=None
+            )
+    
+        with col2:
+            st.metric(
+                "Active Vaults",
+                total_vaults,
+                delta=None
+            )
+    
+        with col3:
+            st.metric(
+                "Total Locked",
+                format_usdt(total_locked),
+                delta=None
+            )
+    
+        with col4:
+            st.metric(
+                "Total Available",
+                format_usdt(total_available),
+                delta=None
+            )
+    else:
+        # Don't show error, just show info message
+        st.info("📊 TVL data will appear here once vaults are created. This is optional and won't affect other features.")
+
+def render_balance(user_pubkey):
+    """Balance metrics and breakdown chart for a user's vault"""
+    try:
+        balance_data = get_vault_balance(user_pubkey)
+    except Exception as e:
+        st.error(f"Error fetching balance: {e}")
+        return
+    if not balance_data:
+        return
+    
+    # Debug: Show raw balance data structure
+    if st.session_state.debug_mode:
+        st.write("Balance data structure:", balance_data)
+        st.write("Available keys:", list(balance_data.keys()) if isinstance(balance_data, dict) else "Not a dict")
+    
+    # Extract balance values (handle both camelCase and snake_case)
+    total_balance = _as_int(balance_data, "totalBalance", "total_balance")
+    available_balance = _as_int(balance_data, "availableBalance", "available_balance")
+    locked_balance = _as_int(balance_data, "lockedBalance", "locked_balance")
+    
+    # Balance metrics
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric(
+            "Total Balance",
+            format_usdt(total_balance),
+            delta=None
+        )
+    
+    with col2:
+        st.metric(
+            "Available Balance",
+            format_usdt(available_balance),
+            delta=None
+        )
+    
+    with col3:
+        st.metric(
+            "Locked Balance",
+            format_usdt(locked_balance),
+            delta=None
+        )
+    
+    # Balance breakdown chart
+    # Imported here so a cold start without a vault to chart skips pandas
+    import pandas as pd
+    
+    st.subheader("Balance Breakdown")
+    # Streamlit's native chart stacks the two series and ships them as Arrow
+    st.bar_chart(
+        pd.DataFrame(
+            {
+                "Available": [available_balance / 1_000_000],
+                "Locked": [locked_balance / 1_000_000],
+            },
+            index=["Balance"]
+        ),
+        color=["#00cc96", "#ff6692"],
+        y_label="USDT",
+        height=300
+    )
+
+def render_transactions(transactions_data, error=None):
+    """Transaction history table, from the page prefetched by fetch_all"""
+    # Imported here so a cold start without a vault to show skips pandas
+    import pandas as pd
+    
+    st.subheader("📜 Transaction History")
+    if error is not None:
+        st.error(f"Error fetching transactions: {error}")
+    
+    # get_transactions returns {"transactions": [...]}, already one page long
+    transactions_list = transactions_data["transactions"] if transactions_data else []
+    
+    if transactions_list and len(transactions_list) > 0:
+        # Convert to DataFrame
+        df = pd.DataFrame(transactions_list)
+    
+        # Debug info - skipped entirely (no to_dict copy) unless enabled in the sidebar
+        if st.session_state.debug_mode:
+            st.write("Available columns:", df.columns.tolist())
+            st.write("DataFrame shape:", df.shape)
+            st.write("Sample data:", df.head(3).to_dict('records'))
+    
+        # Scale raw amounts (6 decimals) to USDT in one vectorized pass;
+        # the "amount" column_config below formats them in the browser
+        if "amount" in df.columns:
+            df["amount"] = pd.to_numeric(df["amount"], errors="coerce").fillna(0) / 1_000_000
+    
+        # Low-cardinality labels as categories keep the Arrow payload small
+        for col in ("transaction_type", "transactionType", "status"):
+            if col in df.columns:
+                df[col] = df[col].astype("category")
+    
+        # Parse the first date column present (name varies by API version)
+        for col in _DATE_COLUMNS:
+            if col in df.columns:
+                try:
+                    df[col] = pd.to_datetime(df[col], utc=True, cache=True)
+                except:
+                    pass
+                break
+    
+        # Show one column per group, in display order (the date pick
+        # matches the column parsed above)
+        display_cols = []
+        for group in _DISPLAY_COLUMNS:
+            col = next((c for c in group if c in df.columns), None)
+            if col:
+                display_cols.append(col)
+    
+        column_config = {
+            "amount": st.column_config.NumberColumn("Amount", format="%.2f USDT")
+        }
+    
+        # Display table with available columns
+        if display_cols:
+            st.dataframe(
+                df[display_cols],
+                use_container_width=True,
+                hide_index=True,
+                column_config=column_config
+            )
+        else:
+            # Fallback: show all available columns
+            st.dataframe(
+                df,
+                use_container_width=True,
+                hide_index=True,
+                column_config=column_config
+            )
+    
+    else:
+        st.info("No transactions found for this user")
+
+# Fetch everything the page needs in one concurrent fan-out
+if "user_wallet" not in st.session_state:
+    st.session_state.user_wallet = ""
+fetched = fetch_all(st.session_state.user_wallet)
 
 # Sidebar
 with st.sidebar:
@@ -114,7 +471,7 @@ with st.sidebar:
     st.markdown("---")
     
     # Backend status
-    if check_backend_health():
+    if fetched["health"]:
         st.success("✅ Backend Connected")
     else:
         st.error("❌ Backend Offline")
@@ -125,10 +482,6 @@ with st.sidebar:
     # User input
     st.subheader("User Wallet")
     
-    # Use session state to persist wallet address
-    if "user_wallet" not in st.session_state:
-        st.session_state.user_wallet = ""
-    
     # Use a form for better UX with Enter key support
     with st.form("wallet_form", clear_on_submit=False):
         user_input = st.text_input(
@@ -168,11 +521,23 @@ with st.sidebar:
     
     # Manual refresh button
     if st.button("🔄 Refresh Balance", help="Manually refresh the balance from the backend"):
+        # Drop cached responses so the rerun hits the backend
+        _drop_vault_cache(st.session_state.user_wallet)
+        get_tvl.clear()
+        check_backend_health.clear()
+        # Just this backend's TVL - the disk cache is shared
+        _disk_cache().delete((BACKEND_URL, "tvl"))
         st.rerun()
     
+    # Shows raw balance data and DataFrame info in the vault sections
+    st.toggle("🔍 Debug", value=False, key="debug_mode",
+              help="Show raw API data for troubleshooting")
+    
+    # WebSocket updates are pushed by the backend, so polling is only needed
+    # without it. st_autorefresh schedules the rerun from the browser instead
+    # of blocking the script thread.
     if auto_refresh and not use_websocket:
-        time.sleep(5)
-        st.rerun()
+        st_autorefresh(interval=5000, key="poll")
     
     # Use session state value
     user_pubkey = st.session_state.user_wallet
@@ -182,7 +547,7 @@ st.title("🏦 Collateral Vault Dashboard")
 st.markdown("Real-time monitoring of vault balances and transactions")
 
 # Check backend
-if not check_backend_health():
+if not fetched["health"]:
     st.error("⚠️ Backend is not running!")
     st.info("""
     To start the backend:
@@ -195,63 +560,7 @@ if not check_backend_health():
 
 # TVL Overview
 st.header("📊 Total Value Locked (TVL)")
-
-# Try to get TVL data, but don't crash if it fails
-try:
-    tvl_data = get_tvl()
-except Exception as e:
-    # Silently fail - TVL is optional
-    tvl_data = None
-
-if tvl_data:
-    # Helper function to get value with fallback for both naming conventions
-    def get_tvl_value(key_snake, key_camel):
-        value = tvl_data.get(key_camel) or tvl_data.get(key_snake) or 0
-        if isinstance(value, str):
-            try:
-                return int(float(value))
-            except:
-                return 0
-        return int(value) if value else 0
-    
-    # API returns camelCase: totalValueLocked, activeVaults, totalLocked, totalAvailable
-    total_tvl = get_tvl_value("total_value_locked", "totalValueLocked")
-    total_vaults = get_tvl_value("active_vaults", "activeVaults")
-    total_locked = get_tvl_value("total_locked", "totalLocked")
-    total_available = get_tvl_value("total_available", "totalAvailable")
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric(
-            "Total TVL",
-            format_usdt(total_tvl),
-            delta=None
-        )
-    
-    with col2:
-        st.metric(
-            "Active Vaults",
-            total_vaults,
-            delta=None
-        )
-    
-    with col3:
-        st.metric(
-            "Total Locked",
-            format_usdt(total_locked),
-            delta=None
-        )
-    
-    with col4:
-        st.metric(
-            "Total Available",
-            format_usdt(total_available),
-            delta=None
-        )
-else:
-    # Don't show error, just show info message
-    st.info("📊 TVL data will appear here once vaults are created. This is optional and won't affect other features.")
+render_tvl()
 
 st.markdown("---")
 
@@ -264,156 +573,23 @@ if user_pubkey:
         st.subheader("🔴 Real-time Updates")
         # Convert http:// to ws:// for WebSocket URL
         ws_url = BACKEND_URL.replace("http://", "ws://").replace("https://", "wss://")
-        create_websocket_component(user_pubkey, ws_url)
+        # Vault updates pushed over the socket rerun the app; drop the
+        # cached responses first so that rerun shows them
+        create_websocket_component(
+            user_pubkey, ws_url,
+            debug=st.session_state.debug_mode,
+            on_update=functools.partial(_drop_vault_cache, user_pubkey)
+        )
         st.markdown("---")
     
-    balance_data = get_vault_balance(user_pubkey)
+    balance_data = fetched["balance"]
+    if "balance" in fetched["errors"]:
+        st.error(f"Error fetching balance: {fetched['errors']['balance']}")
     
     if balance_data:
-        # Helper function to get value with fallback for both naming conventions
-        def get_balance_value(key_snake, key_camel):
-            value = balance_data.get(key_camel) or balance_data.get(key_snake) or 0
-            # Convert to int if it's a string or float
-            if isinstance(value, str):
-                try:
-                    return int(float(value))
-                except:
-                    return 0
-            return int(value) if value else 0
-        
-        # Debug: Show raw balance data structure
-        if st.checkbox("🔍 Debug: Show Balance Data", key="debug_balance"):
-            st.write("Balance data structure:", balance_data)
-            st.write("Available keys:", list(balance_data.keys()) if isinstance(balance_data, dict) else "Not a dict")
-        
-        # Extract balance values (handle both camelCase and snake_case)
-        total_balance = get_balance_value("total_balance", "totalBalance")
-        available_balance = get_balance_value("available_balance", "availableBalance")
-        locked_balance = get_balance_value("locked_balance", "lockedBalance")
-        
-        # Balance metrics
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.metric(
-                "Total Balance",
-                format_usdt(total_balance),
-                delta=None
-            )
-        
-        with col2:
-            st.metric(
-                "Available Balance",
-                format_usdt(available_balance),
-                delta=None
-            )
-        
-        with col3:
-            st.metric(
-                "Locked Balance",
-                format_usdt(locked_balance),
-                delta=None
-            )
-        
-        # Balance breakdown chart
-        st.subheader("Balance Breakdown")
-        fig = go.Figure(data=[
-            go.Bar(
-                name="Available",
-                x=["Balance"],
-                y=[available_balance / 1_000_000],
-                marker_color="#00cc96"
-            ),
-            go.Bar(
-                name="Locked",
-                x=["Balance"],
-                y=[locked_balance / 1_000_000],
-                marker_color="#ff6692"
-            )
-        ])
-        fig.update_layout(
-            barmode='stack',
-            title="Vault Balance Distribution",
-            yaxis_title="USDT",
-            height=300
-        )
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # Transaction history
-        st.subheader("📜 Transaction History")
-        transactions_data = get_transactions(user_pubkey)
-        
-        # Extract transactions array from API response
-        transactions_list = []
-        if transactions_data:
-            if isinstance(transactions_data, dict):
-                # API returns: {"transactions": [...], "total": 42, ...}
-                if "transactions" in transactions_data:
-                    transactions_list = transactions_data["transactions"]
-                elif isinstance(transactions_data.get("data"), list):
-                    transactions_list = transactions_data["data"]
-            elif isinstance(transactions_data, list):
-                transactions_list = transactions_data
-        
-        if transactions_list and len(transactions_list) > 0:
-            # Convert to DataFrame
-            df = pd.DataFrame(transactions_list)
-            
-            # Debug option (can be removed later)
-            if st.checkbox("🔍 Debug: Show DataFrame Info", key="debug_transactions"):
-                st.write("Available columns:", df.columns.tolist())
-                st.write("DataFrame shape:", df.shape)
-                st.write("Sample data:", df.head(3).to_dict('records'))
-            
-            # Format columns if they exist
-            if "amount" in df.columns:
-                df["amount_formatted"] = df["amount"].apply(
-                    lambda x: format_usdt(x) if pd.notna(x) and x is not None else "0.00 USDT"
-                )
-            elif "formatted_amount" in df.columns:
-                df["amount_formatted"] = df["formatted_amount"]
-            else:
-                df["amount_formatted"] = "N/A"
-            
-            # Handle date column (try different possible names)
-            date_col = None
-            for col in ["created_at", "createdAt", "timestamp", "date"]:
-                if col in df.columns:
-                    date_col = col
-                    try:
-                        df[col] = pd.to_datetime(df[col])
-                    except:
-                        pass
-                    break
-            
-            # Build display columns - check what actually exists
-            display_cols = []
-            if "transaction_type" in df.columns or "transactionType" in df.columns:
-                display_cols.append("transaction_type" if "transaction_type" in df.columns else "transactionType")
-            if "amount_formatted" in df.columns:
-                display_cols.append("amount_formatted")
-            if "status" in df.columns:
-                display_cols.append("status")
-            if date_col:
-                display_cols.append(date_col)
-            
-            # Display table with available columns
-            if display_cols:
-                st.dataframe(
-                    df[display_cols].head(20),
-                    use_container_width=True,
-                    hide_index=True
-                )
-            else:
-                # Fallback: show all available columns
-                st.dataframe(
-                    df.head(20),
-                    use_container_width=True,
-                    hide_index=True
-                )
-        
-        else:
-            st.info("No transactions found for this user")
+        # Rendered with the page; only render_tvl reruns on its own timer
+        render_balance(user_pubkey)
+        render_transactions(fetched["transactions"], fetched["errors"].get("transactions"))
         
         # Vault details
         with st.expander("📋 Vault Details"):
@@ -426,9 +602,4 @@ else:
 
 # Footer
 st.markdown("---")
-st.markdown("""
-<div style='text-align: center; color: #666;'>
-    <p>Collateral Vault Dashboard | Built with Streamlit</p>
-    <p>Backend API: <code>{}</code></p>
-</div>
-""".format(BACKEND_URL), unsafe_allow_html=True)
+st.markdown(_FOOTER, unsafe_allow_html=True)
@@ -0,0 +1,560 @@
+// Vault dashboard WebSocket client.
+//
+// Runs inside the vault_ws Streamlit component (index.html), declared in
+// websocket_integration.py. Config arrives with each render as
+// args = {url, debug}; vault updates are reported back with
+// setComponentValue, which reruns the app.
+(function() {
+    // Per-component config, set from the first render's args
+    let WS_URL = null;
+
+    // Logging is off unless the dashboard's Debug toggle is on (or
+    // window.VAULT_WS_DEBUG = true is set before load); errors are always reported
+    let DEBUG = window.VAULT_WS_DEBUG === true;
+    const log = (...args) => {
+        if (DEBUG) console.log(...args);
+    };
+
+    // Streamlit component protocol (what streamlit-component-lib sends)
+    const FRAME_HEIGHT = 120;
+    function sendToStreamlit(type, data) {
+        window.parent.postMessage(Object.assign({ isStreamlitMessage: true, type: type }, data), '*');
+    }
+
+    // Prevent multiple WebSocket connections
+    if (window.vaultWebSocket && window.vaultWebSocket.readyState === WebSocket.OPEN) {
+        log('⚠️ WebSocket already connected, reusing existing connection');
+        return;
+    }
+
+    // Wait for DOM to be ready
+    let lastBalance = null;
+    let lastBalanceKey = '';
+    let notificationCount = 0;
+    let refreshTimer = null;
+
+    // Base units (6 decimals) to a 2dp USDT string
+    const fmt = v => (v / 1000000).toFixed(2);
+    // Shared decoder for binary frames, instead of one per message
+    const decoder = new TextDecoder();
+
+    // Tell the app the vault changed: a new component value reruns the
+    // script, and its on_change callback drops the cached balance and
+    // transactions first. Debounced: every update restarts the timer, so
+    // a burst of messages leads to a single rerun 300ms after the last one.
+    function scheduleRefresh() {
+        clearTimeout(refreshTimer);
+        refreshTimer = setTimeout(() => {
+            // A timestamp, so the value always differs from the last one
+            sendToStreamlit('streamlit:setComponentValue', { value: Date.now(), dataType: 'json' });
+        }, 300);
+    }
+
+    // Status elements, looked up once instead of on every message
+    // (index.html loads this script after the status markup)
+    let statusTextEl = document.getElementById('ws-status-text');
+    let statusMessageEl = document.getElementById('ws-status-message');
+    let containerEl = document.getElementById('ws-status');
+
+    // Status updates are coalesced: bursts of messages only record the
+    // latest status, and it is painted once on the next animation frame
+    let pendingStatus = null;
+    let rafScheduled = false;
+
+    function updateStatus(status, message) {
+        pendingStatus = { status, message };
+        if (!rafScheduled) {
+            rafScheduled = true;
+            requestAnimationFrame(flushStatus);
+        }
+    }
+
+    function flushStatus() {
+        const { status, message } = pendingStatus;
+        pendingStatus = null;
+        rafScheduled = false;
+        paintStatus(status, message);
+    }
+
+    // Paint status display using the cached elements; only query the
+    // DOM again if a reference is missing (e.g. Streamlit re-rendered)
+    function paintStatus(status, message) {
+        const statusText = statusTextEl || (statusTextEl = document.getElementById('ws-status-text'));
+        const statusMessage = statusMessageEl || (statusMessageEl = document.getElementById('ws-status-message'));
+        const container = containerEl || (containerEl = document.getElementById('ws-status'));
+
+        if (statusText && statusMessage && container) {
+            // Colors are CSS variables keyed off data-state, so a status
+            // change is one attribute write plus the text
+            container.dataset.state = status;
+            statusText.textContent = status.toUpperCase();
+            statusMessage.textContent = message;
+
+            log('✅ Status updated to:', status, '-', message);
+        } else {
+            console.warn('Status elements not found, retrying in 100ms...');
+            // Retry unless a newer status has been queued meanwhile
+            setTimeout(() => {
+                if (!pendingStatus) updateStatus(status, message);
+            }, 100);
+        }
+    }
+
+    // Event names arrive as snake_case from the backend; camelCase
+    // aliases are normalized so dispatch only needs one name per event
+    function normalizeEvent(name) {
+        return String(name).replace(/[A-Z]/g, c => '_' + c.toLowerCase());
+    }
+
+    // Parse one raw frame into a list of { event, data, total, avail, locked, amt }
+    // with the balance fields pre-formatted. Runs in the parser worker
+    // when available (its source is built from these functions).
+    //
+    // A frame is either a single event or a batch, so the backend can
+    // coalesce bursts into one frame:
+    //   {"event": "balance_update", "data": {...}}
+    //   [{"event": "balance_update", "data": {...}}, {"event": "transaction_confirmed", "data": {...}}]
+    // Batch entries are applied in order; a run of consecutive balance_update
+    // entries is collapsed to its last one, since each carries the full balance.
+    function parseFrame(raw) {
+        try {
+            // Text frames arrive as strings, binary frames as ArrayBuffer
+            // (or Uint8Array from WebSocketStream); both carry UTF-8 JSON
+            const text = typeof raw === 'string' ? raw : decoder.decode(raw);
+            const parsed = JSON.parse(text);
+            const messages = Array.isArray(parsed) ? parsed : [parsed];
+            const out = [];
+            messages.forEach((message, i) => {
+                const event = normalizeEvent(message.event);
+                const next = messages[i + 1];
+                if (event === 'balance_update' && next && normalizeEvent(next.event) === event) {
+                    return;
+                }
+                const data = message.data || {};
+                out.push({
+                    event: event,
+                    data: data,
+                    total: fmt(data.totalBalance || 0),
+                    avail: fmt(data.availableBalance || 0),
+                    locked: fmt(data.lockedBalance || 0),
+                    amt: fmt(data.amount || 0)
+                });
+            });
+            return out;
+        } catch (e) {
+            return [{ error: String(e), raw: raw }];
+        }
+    }
+
+    // Parse frames off the main thread so only DOM work happens here.
+    // Falls back to parsing inline if workers are unavailable.
+    let parser = null;
+    let inFlight = 0; // frames posted to the worker but not yet queued
+    try {
+        const workerSrc = 'const fmt = ' + fmt + ';\nconst decoder = new TextDecoder();\n' +
+            normalizeEvent + '\n' + parseFrame +
+            '\nonmessage = e => postMessage(parseFrame(e.data));';
+        parser = new Worker(URL.createObjectURL(new Blob([workerSrc], { type: 'text/javascript' })));
+        parser.onmessage = e => {
+            inFlight--;
+            enqueue(e.data);
+        };
+    } catch (e) {
+        console.warn('Parser worker unavailable, parsing on the main thread:', e);
+        parser = null;
+    }
+
+    // Balance events are often re-broadcast unchanged; skip those so
+    // they don't restyle, dispatch or refresh again
+    function isRepeatBalance(data) {
+        const key = data.totalBalance + '|' + data.availableBalance + '|' + data.lockedBalance;
+        if (key === lastBalanceKey) return true;
+        lastBalanceKey = key;
+        return false;
+    }
+
+    // Per-event handlers; each gets the parsed frame from parseFrame()
+
+    // Handle balance update event
+    function onBalance({ data, total, avail, locked }) {
+        if (isRepeatBalance(data)) return;
+        log('💰 Balance update received:', {
+            total, available: avail, locked, rawData: data
+        });
+
+        // Store latest balance
+        lastBalance = { total, available: avail, locked };
+
+        // Show notification
+        notificationCount++;
+        updateStatus('connected', 
+            `💰 Balance updated! Total: ${total} USDT, Available: ${avail} USDT, Locked: ${locked} USDT`);
+
+        // Dispatch custom event for Streamlit to handle
+        window.dispatchEvent(new CustomEvent('balanceUpdated', {
+            detail: {
+                totalBalance: data.totalBalance || 0,
+                availableBalance: data.availableBalance || 0,
+                lockedBalance: data.lockedBalance || 0,
+                formattedTotal: total,
+                formattedAvailable: avail,
+                formattedLocked: locked
+            }
+        }));
+
+        // Refresh once the burst of updates has settled
+        scheduleRefresh();
+    }
+
+    // Handle transaction confirmed event
+    function onTx({ data, amt }) {
+        const txType = data.transactionType.charAt(0).toUpperCase() + data.transactionType.slice(1);
+        notificationCount++;
+        updateStatus('connected', 
+            `✅ Transaction confirmed: ${txType} of ${amt} USDT`);
+
+        log('✅ Transaction confirmed:', txType, amt, 'USDT');
+
+        // Dispatch custom event for Streamlit
+        window.dispatchEvent(new CustomEvent('transactionConfirmed', { detail: data }));
+
+        // Refresh once the burst of updates has settled
+        scheduleRefresh();
+    }
+
+    // Handle collateral locked event
+    function onLock({ data, total, avail, locked, amt }) {
+        if (isRepeatBalance(data)) return;
+        notificationCount++;
+        updateStatus('connected', 
+            `🔒 Collateral locked: ${amt} USDT (Total locked: ${locked} USDT)`);
+
+        // Update balance
+        lastBalance = { total, available: avail, locked };
+
+        // Trigger refresh
+        window.dispatchEvent(new CustomEvent('balanceUpdated', {
+            detail: {
+                totalBalance: data.totalBalance,
+                availableBalance: data.availableBalance,
+                lockedBalance: data.lockedBalance
+            }
+        }));
+    }
+
+    // Handle collateral unlocked event
+    function onUnlock({ data, total, avail, locked, amt }) {
+        if (isRepeatBalance(data)) return;
+        notificationCount++;
+        updateStatus('connected', 
+            `🔓 Collateral unlocked: ${amt} USDT (Total locked: ${locked} USDT)`);
+
+        // Update balance
+        lastBalance = { total, available: avail, locked };
+
+        // Refresh once the burst of updates has settled
+        scheduleRefresh();
+    }
+
+    // Handle health update (welcome message from backend)
+    function onHealth({ data }) {
+        const statusMsg = data.message || 'Connected and listening for updates';
+        updateStatus('connected', statusMsg);
+        log('✅ Health update received:', data);
+    }
+
+    // Event name (already normalized to snake_case) -> handler
+    const handlers = {
+        balance_update: onBalance,
+        transaction_confirmed: onTx,
+        collateral_locked: onLock,
+        collateral_unlocked: onUnlock,
+        health_update: onHealth
+    };
+
+    // Apply one parsed frame: status text, custom events, refreshes
+    function dispatch(parsed) {
+        if (parsed.error) {
+            console.error('Error parsing WebSocket message:', parsed.error);
+            console.error('Raw message:', parsed.raw);
+            return;
+        }
+        log('📨 WebSocket message received:', parsed.event, parsed.data);
+        const handler = handlers[parsed.event];
+        if (!handler) return;
+        // A bad frame must not abort drain() and strand the queue behind it
+        try {
+            handler(parsed);
+        } catch (e) {
+            console.error('Error handling WebSocket message:', parsed.event, e);
+            console.error('Message data:', parsed.data);
+        }
+    }
+
+    // Bounded inbox: the socket has no flow control, so a burst could
+    // otherwise queue unbounded work on the main thread. Parsed events are
+    // queued (oldest dropped past MAX_QUEUE) and drained at most
+    // DRAIN_PER_FRAME per animation frame.
+    const MAX_QUEUE = 64;
+    const DRAIN_PER_FRAME = 8;
+    const queue = [];
+    let drainScheduled = false;
+    let droppedCount = 0;
+
+    function enqueue(batch) {
+        for (const parsed of batch) {
+            queue.push(parsed);
+            if (queue.length > MAX_QUEUE) {
+                queue.shift();
+                droppedCount++;
+            }
+        }
+        if (!drainScheduled) {
+            drainScheduled = true;
+            requestAnimationFrame(drain);
+        }
+    }
+
+    function drain() {
+        drainScheduled = false;
+        for (let i = 0; i < DRAIN_PER_FRAME && queue.length; i++) {
+            dispatch(queue.shift());
+        }
+        if (roomWaiters.length && hasRoom()) {
+            roomWaiters.splice(0).forEach(resolve => resolve());
+        }
+        if (queue.length) {
+            drainScheduled = true;
+            requestAnimationFrame(drain);
+        } else if (droppedCount) {
+            // Burst is over; tell the user some updates were skipped
+            updateStatus('connected', `${droppedCount} updates coalesced - showing the latest`);
+            droppedCount = 0;
+        }
+    }
+
+    // Hand one raw frame to the parser (worker or inline)
+    function accept(raw) {
+        lastActivity = Date.now();
+        if (parser) {
+            inFlight++;
+            parser.postMessage(raw);
+        } else {
+            enqueue(parseFrame(raw));
+        }
+    }
+
+    // Stream reads wait on this instead of dropping frames, so a slow UI
+    // stops reading and TCP pushes back on the server
+    const roomWaiters = [];
+    function hasRoom() {
+        return queue.length + inFlight < MAX_QUEUE;
+    }
+    function waitForRoom() {
+        return hasRoom() ? Promise.resolve() : new Promise(resolve => roomWaiters.push(resolve));
+    }
+    // Wake a parked reader, e.g. so it can notice its socket is closing
+    function releaseWaiters() {
+        roomWaiters.splice(0).forEach(resolve => resolve());
+    }
+
+    // Reconnect state: attempts resets once a connection opens
+    let reconnectAttempts = 0;
+    let unloading = false;
+
+    // Heartbeat: peers that vanish without a close frame (NAT/proxy idle
+    // timeouts) would otherwise leave the socket silently dead. An idle
+    // socket is pinged (the backend echoes any text frame back), and it is
+    // dropped and reopened only if that ping goes unanswered. Idle time
+    // alone never drops it: background tabs throttle timers to about once
+    // a minute, so a tick can see a long idle gap on a healthy socket.
+    const HEARTBEAT_MS = 10000;
+    const PING_AFTER_MS = 30000;
+    const PONG_TIMEOUT_MS = 10000;
+    const PING = '{"event":"ping"}';
+    let lastActivity = Date.now();
+
+    function startHeartbeat(ping, drop) {
+        lastActivity = Date.now();
+        let pingSentAt = 0; // 0 while no ping is waiting for an answer
+        const hb = setInterval(() => {
+            // The stream reader is parked on a full queue: nothing is being
+            // read on purpose, so silence says nothing about the peer
+            if (roomWaiters.length) return;
+            const now = Date.now();
+            if (pingSentAt) {
+                if (lastActivity >= pingSentAt) {
+                    pingSentAt = 0;
+                } else if (now - pingSentAt > PONG_TIMEOUT_MS) {
+                    clearInterval(hb);
+                    log('Ping unanswered for', now - pingSentAt, 'ms, reconnecting');
+                    drop();
+                    return;
+                }
+            }
+            if (!pingSentAt && now - lastActivity > PING_AFTER_MS) {
+                ping();
+                pingSentAt = now;
+            }
+        }, HEARTBEAT_MS);
+        return hb;
+    }
+
+    // Shared close handling for both socket flavors
+    function onClosed(code, reason) {
+        log('WebSocket disconnected. Code:', code, 'Reason:', reason);
+        if (code === 1000) {
+            updateStatus('disconnected', 'Connection closed normally');
+        } else if (!unloading) {
+            updateStatus('disconnected', 'Connection closed unexpectedly. Attempting to reconnect...');
+            // Reopen just the socket with exponential backoff (0.5s, 1s, 2s ... 30s)
+            setTimeout(connect, Math.min(30000, 500 * 2 ** reconnectAttempts++));
+        }
+    }
+
+    // Open the socket. Called again on an unexpected close, so
+    // reconnecting doesn't reload the page.
+    function connect() {
+        if ('WebSocketStream' in window) {
+            connectStream();
+        } else {
+            connectSocket();
+        }
+    }
+
+    // WebSocketStream (Chromium): reads are pulled, so backpressure
+    // comes for free as long as we only read when the queue has room
+    async function connectStream() {
+        const wss = new window.WebSocketStream(WS_URL);
+        // Minimal WebSocket-like handle for the duplicate guard and unload
+        const handle = {
+            readyState: WebSocket.CONNECTING,
+            close: code => {
+                wss.close({ closeCode: code });
+                releaseWaiters();
+            }
+        };
+        window.vaultWebSocket = handle;
+        let code = 1006, reason = '';
+        let hb = null, timedOut = false;
+        try {
+            const { readable, writable } = await wss.opened;
+            handle.readyState = WebSocket.OPEN;
+            reconnectAttempts = 0;
+            updateStatus('connected', 'Connected! Receiving real-time updates...');
+            const reader = readable.getReader();
+            const writer = writable.getWriter();
+            hb = startHeartbeat(
+                () => writer.write(PING).catch(() => {}),
+                () => {
+                    // Don't wait on a close handshake a dead peer won't answer
+                    timedOut = true;
+                    wss.close({ closeCode: 4000, reason: 'heartbeat timeout' });
+                    reader.cancel().catch(() => {});
+                    releaseWaiters();
+                }
+            );
+            while (!timedOut) {
+                if (!hasRoom()) {
+                    await waitForRoom();
+                    // Restart the idle clock: the pause was ours, not the peer's
+                    lastActivity = Date.now();
+                }
+                if (timedOut) break;
+                const { value, done } = await reader.read();
+                if (done) break;
+                accept(value);
+            }
+            if (timedOut) {
+                code = 4000;
+                reason = 'heartbeat timeout';
+            } else {
+                ({ closeCode: code, reason } = await wss.closed);
+            }
+        } catch (e) {
+            updateStatus('error', 'Connection error. Check backend is running.');
+            console.error('WebSocketStream error:', e);
+        }
+        clearInterval(hb);
+        handle.readyState = WebSocket.CLOSED;
+        onClosed(code, reason);
+    }
+
+    // Classic WebSocket: no flow control, the bounded queue drops oldest
+    function connectSocket() {
+        const ws = new WebSocket(WS_URL);
+        window.vaultWebSocket = ws; // Store globally to prevent duplicates
+        // Binary frames come in as ArrayBuffer so the parser can decode
+        // them without a Blob round trip. The backend sends text today;
+        // switching to binary frames with the permessage-deflate extension
+        // ("permessage-deflate; client_no_context_takeover") is handled
+        // transparently, since the browser inflates before onmessage.
+        ws.binaryType = 'arraybuffer';
+        let hb = null;
+
+        // Handle connection open
+        ws.onopen = function() {
+            log('✅ WebSocket connection opened - readyState:', ws.readyState);
+            reconnectAttempts = 0;
+            hb = startHeartbeat(
+                () => ws.readyState === WebSocket.OPEN && ws.send(PING),
+                () => {
+                    // Detach first: a dead peer may never complete the close
+                    // handshake, so reconnect without waiting for onclose
+                    ws.onmessage = ws.onclose = ws.onerror = null;
+                    ws.close(4000, 'heartbeat timeout');
+                    onClosed(4000, 'heartbeat timeout');
+                }
+            );
+            // Update status immediately
+            updateStatus('connected', 'Connected! Receiving real-time updates...');
+        };
+
+        // Handle incoming messages
+        ws.onmessage = function(event) {
+            accept(event.data);
+        };
+
+        // Handle errors
+        ws.onerror = function(error) {
+            updateStatus('error', 'Connection error. Check backend is running.');
+            console.error('WebSocket error:', error);
+            console.error('WebSocket state:', ws.readyState);
+        };
+
+        // Handle disconnection
+        ws.onclose = function(event) {
+            clearInterval(hb);
+            onClosed(event.code, event.reason);
+        };
+
+        // Log connection state changes
+        log('WebSocket initial state:', ws.readyState);
+        log('WebSocket URL:', WS_URL);
+    }
+    // Connect on the first render, once the URL is known. Later renders
+    // only update the debug flag; a different wallet gets a new component
+    // instance (keyed by wallet), so the URL never changes here.
+    window.addEventListener('message', function(event) {
+        if (!event.data || event.data.type !== 'streamlit:render') return;
+        const args = event.data.args || {};
+        DEBUG = window.VAULT_WS_DEBUG === true || args.debug === true;
+        if (WS_URL === null) {
+            WS_URL = args.url;
+            connect();
+        }
+    });
+    sendToStreamlit('streamlit:componentReady', { apiVersion: 1 });
+    sendToStreamlit('streamlit:setFrameHeight', { height: FRAME_HEIGHT });
+
+    // Expose balance getter for Streamlit
+    window.getLastBalance = function() {
+        return lastBalance;
+    };
+
+    // Cleanup on page unload
+    window.addEventListener('beforeunload', function() {
+        unloading = true;
+        window.vaultWebSocket.close(1000);
+    });
+})();